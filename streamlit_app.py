@@ -1,36 +1,208 @@
-import json
+import asyncio
 import re
 import time
 import random
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
 
+import aiohttp
+import orjson
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Headers to mimic a real browser
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'br, gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# URL substrings identifying each scraper type, checked in order
+_URL_MARKERS = (
+    ('cruises.flightcentre', 'cruise'),
+    ('tours.flightcentre', 'tour'),
+)
+
+# Itinerary day patterns
+_DAY_RE = re.compile(r'Day\s+(\d+)')
+_DAY_COLON_RE = re.compile(r'Day (\d+):')
+_DAY_PREFIX_RE = re.compile(r'^Day \d+:\s*')
+
+# A full stop with any surrounding whitespace and repeated stops
+_SENTENCE_BREAK_RE = re.compile(r'[\s.]*\.[\s.]*')
+
+# Unicode characters replaced with ASCII equivalents by clean_text
+_ASCII_TRANSLATION = str.maketrans({
+    '\u2013': '-',  # en dash → hyphen
+    '\u2014': '-',  # em dash → hyphen
+    '\u2019': "'",  # right single quotation mark → apostrophe
+    '\u2018': "'",  # left single quotation mark → apostrophe
+    '\u201c': '"',  # left double quotation mark → straight quote
+    '\u201d': '"',  # right double quotation mark → straight quote
+    '\u2026': '...',  # horizontal ellipsis → three dots
+})
+
+
+def _has_class(class_name):
+    """Build an XPath predicate matching elements whose class list contains class_name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def _first(xpath, element):
+    """Return the first node matched by a compiled XPath, or None"""
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+
+def _text(element):
+    """Join the stripped text nodes under element, like BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+# Cruise itinerary lookups
+_CRUISE_CONTAINER_XPATH = etree.XPath(f"(//div[{_has_class('grid-item-block-dates-accordion')}])[1]")
+_CRUISE_ALT_CONTAINER_XPATH = etree.XPath(f"(//div[{_has_class('accordion-block')}])[1]")
+_CRUISE_DAY_XPATH = etree.XPath(f".//div[{_has_class('date-list')}]")
+_CONTENT_WRAP_XPATH = etree.XPath(f"(.//div[{_has_class('content-wrap')}])[1]")
+_TEXT_SUMMARY_XPATH = etree.XPath(f"(.//span[{_has_class('text-info-summary')}])[1]")
+_DESCR_XPATH = etree.XPath(f"(.//div[{_has_class('descr')}])[1]")
+# Text under descr, minus the "More" and "Less" toggle buttons
+_DESCR_TEXT_XPATH = etree.XPath(
+    f".//text()[not(ancestor::span[{_has_class('more')} or {_has_class('less')}])]",
+    smart_strings=False
+)
+
+# Tour itinerary lookups
+_TOUR_DESCRIPTION_XPATH = etree.XPath(f"(//div[{_has_class('ao-clp-custom-tdp-itinerary__description')}])[1]")
+_TOUR_SECTION_XPATH = etree.XPath(f"(//section[{_has_class('ao-clp-custom-tdp-itinerary')}])[1]")
+_TOUR_DAY_XPATH = etree.XPath(f".//li[{_has_class('js-ao-common-accordion')}]")
+_TOUR_TITLE_XPATH = etree.XPath(f"(.//div[{_has_class('js-ao-common-accordion__title')}])[1]")
+_TOUR_ARROW_XPATH = etree.XPath(f"(.//div[{_has_class('ao-common-accordion__arrow')}])[1]")
+_TOUR_CONTENT_XPATH = etree.XPath(f"(.//div[{_has_class('ao-common-accordion__bottom-content')}])[1]")
+
+
+# Options for the per-page streaming parsers
+_PARSER_OPTIONS = {
+    # Flight Centre pages are served as UTF-8, so decode them directly rather
+    # than having the HTTP client sniff the charset
+    'encoding': 'utf-8',
+    # Nothing looks elements up by id, and comments and blank text nodes are
+    # never read, so skip building them
+    'collect_ids': False,
+    'remove_comments': True,
+    'remove_blank_text': True,
+}
+
+# (tag, class) of the elements each parser needs; once all have been closed
+# the rest of the page can be skipped
+_ITINERARY_END_MARKERS = {
+    'cruise': {('div', 'grid-item-block-dates-accordion')},
+    'tour': {
+        ('section', 'ao-clp-custom-tdp-itinerary'),
+        ('div', 'ao-clp-custom-tdp-itinerary__description'),
+    },
+}
+
+# Size of the response chunks fed to the streaming parser
+_CHUNK_SIZE = 65536
+
+
+class _ItineraryParser:
+    """Incrementally parse a page, tracking when its itinerary markup is complete"""
+    
+    def __init__(self, scraper_type):
+        self._pending = set(_ITINERARY_END_MARKERS[scraper_type])
+        self._parser = etree.HTMLPullParser(
+            events=('end',),
+            tag={tag for tag, _ in self._pending},
+            **_PARSER_OPTIONS
+        )
+    
+    def feed(self, chunk):
+        """Feed a chunk of the page, returning True once the itinerary is complete"""
+        self._parser.feed(chunk)
+        for _, element in self._parser.read_events():
+            self._pending.difference_update(
+                (element.tag, class_name) for class_name in element.get('class', '').split()
+            )
+        return not self._pending
+    
+    def close(self):
+        """Finish parsing and return the root element"""
+        try:
+            return self._parser.close()
+        except etree.LxmlError as e:
+            raise Exception(f"Failed to parse page: {e}")
+
+
+@st.cache_resource
+def _warm_up_parser():
+    """Run a throwaway parse once per server process"""
+    # Pays lxml's first-use cost before the first user action
+    parser = _ItineraryParser('tour')
+    parser.feed(b'<html></html>')
+    parser.close()
+
+
+# Warm up on import so server start, not the first click, pays for it
+_warm_up_parser()
+
+
+def create_session():
+    """Create a requests session with browser headers, a sized pool and retries"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+@st.cache_resource
+def get_session():
+    """Shared session so keep-alive connections survive across reruns"""
+    return create_session()
+
+
+@st.cache_resource(max_entries=32)
+def _robots_for(base_url, _session):
+    """Fetch and parse a host's robots.txt once per server process"""
+    robots = RobotFileParser(urljoin(base_url, '/robots.txt'))
+    try:
+        response = _session.get(robots.url, timeout=10)
+    except requests.RequestException:
+        response = None
+    
+    if response is not None and response.status_code == 200:
+        robots.parse(response.text.splitlines())
+    else:
+        robots.allow_all = True
+    return robots
 
 
 class FlightCentreScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        # Set headers to mimic a real browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+    def __init__(self, session=None):
+        self.session = session if session is not None else create_session()
     
-    def determine_scraper_type(self, url):
+    @staticmethod
+    def determine_scraper_type(url):
         """Determine if the URL is for a cruise or tour"""
-        if "cruises.flightcentre" in url:
-            return "cruise"
-        elif "tours.flightcentre" in url:
-            return "tour"
-        else:
-            return None
+        for marker, scraper_type in _URL_MARKERS:
+            if marker in url:
+                return scraper_type
+        return None
     
     def determine_icon(self, title):
         """Determine the appropriate icon based on the title"""
@@ -41,170 +213,164 @@ class FlightCentreScraper:
     
     def check_robots_txt(self, base_url):
         """Check robots.txt to understand crawling restrictions"""
-        try:
-            robots_url = urljoin(base_url, '/robots.txt')
-            response = self.session.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                # Add a small delay to be respectful
-                time.sleep(random.uniform(1, 3))
-            return True
-        except Exception:
-            return True
+        return _robots_for(base_url, self.session)
     
-    def fetch_page(self, url):
-        """Fetch the webpage content"""
+    def fetch_page(self, url, scraper_type):
+        """Fetch the webpage, parsing it as it downloads"""
         try:
             # Add random delay to avoid being blocked
             time.sleep(random.uniform(1, 2))
             
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return response.text
+            parser = _ItineraryParser(scraper_type)
+            with self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(_CHUNK_SIZE):
+                    if parser.feed(chunk):
+                        # Skip the rest of the page once the itinerary is parsed
+                        break
+            return parser.close()
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch page: {e}")
     
+    async def _fetch(self, session, url, scraper_type):
+        """Fetch the webpage on a shared aiohttp session, parsing it as it downloads"""
+        try:
+            # Add random delay to avoid being blocked
+            await asyncio.sleep(random.uniform(1, 2))
+            
+            parser = _ItineraryParser(scraper_type)
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                    if parser.feed(chunk):
+                        # Skip the rest of the page once the itinerary is parsed
+                        break
+            return parser.close()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise Exception(f"Failed to fetch page: {e}")
+    
     def clean_text(self, text):
         """Clean text by replacing Unicode characters with ASCII equivalents"""
         if not text:
             return text
         
         # Replace Unicode characters with ASCII equivalents
-        replacements = {
-            '\u2013': '-',  # en dash → hyphen
-            '\u2014': '-',  # em dash → hyphen
-            '\u2019': "'",  # right single quotation mark → apostrophe
-            '\u2018': "'",  # left single quotation mark → apostrophe
-            '\u201c': '"',  # left double quotation mark → straight quote
-            '\u201d': '"',  # right double quotation mark → straight quote
-            '\u2026': '...',  # horizontal ellipsis → three dots
-        }
+        return text.translate(_ASCII_TRANSLATION)
+
+    def parse_cruise_itinerary_days(self, itinerary_container):
+        """Extract individual cruise itinerary days from the itinerary container"""
+        if itinerary_container is None:
+            return []
         
-        for unicode_char, ascii_char in replacements.items():
-            text = text.replace(unicode_char, ascii_char)
+        # Find all date-list items within the container
+        day_items = _CRUISE_DAY_XPATH(itinerary_container)
         
-        return text
-
-    def parse_cruise_itinerary_days(self, soup):
-        """Extract individual cruise itinerary days"""
-        itinerary_items = []
+        # Bind the per-day helpers once rather than looking them up for every day
+        parse_day = self._parse_cruise_day
+        clean = self.clean_text
+        icon_for = self.determine_icon
+        search_day = _DAY_RE.search
         
-        # Find the itinerary container first
-        itinerary_container = soup.find('div', class_='grid-item-block-dates-accordion')
-        if not itinerary_container:
-            # Try alternative selector
-            itinerary_container = soup.find('div', class_='accordion-block')
+        parsed_days = (parse_day(item, clean, icon_for, search_day) for item in day_items)
+        return [day_info for day_info in parsed_days if day_info is not None]
+    
+    @staticmethod
+    def _parse_cruise_day(item, clean, icon_for, search_day):
+        """Extract a single cruise itinerary day, or None if it should be skipped"""
+        day_info = {}
         
-        if not itinerary_container:
-            return itinerary_items
+        # Initialize all required keys
+        day_info['icon'] = "location"  # Default icon value
+        day_info['day'] = ""
+        day_info['title'] = ""
+        day_info['image'] = ""
+        day_info['body'] = ""
         
-        # Find all date-list items within the container
-        day_items = itinerary_container.find_all('div', class_='date-list')
+        # Get all direct child div elements
+        divs = item.findall('div')
         
-        for item in day_items:
-            day_info = {}
-            
-            # Initialize all required keys
-            day_info['icon'] = "location"  # Default icon value
-            day_info['day'] = ""
-            day_info['title'] = ""
-            day_info['image'] = ""
-            day_info['body'] = ""
+        if len(divs) >= 2:  # Should have at least 2 divs: day/date and location
+            # First div contains day number and date
+            first_div = divs[0]
+            day_h5 = first_div.find('.//h5')
+            if day_h5 is not None:
+                day_text = _text(day_h5)
+                # Extract day number from "Day 1", "Day 2", etc.
+                day_match = search_day(day_text)
+                if day_match:
+                    day_info['day'] = day_match.group(1)
+                else:
+                    # Skip if it doesn't match day pattern
+                    return None
             
-            # Get all direct child div elements
-            divs = item.find_all('div', recursive=False)
+            # Second div contains location and description
+            second_div = divs[1]
+            location_h5 = second_div.find('.//h5')
+            if location_h5 is not None:
+                location_text = _text(location_h5)
+                day_info['title'] = clean(location_text)
+                # Set icon based on title
+                day_info['icon'] = icon_for(day_info['title'])
             
-            if len(divs) >= 2:  # Should have at least 2 divs: day/date and location
-                # First div contains day number and date
-                first_div = divs[0]
-                day_h5 = first_div.find('h5')
-                if day_h5:
-                    day_text = day_h5.get_text(strip=True)
-                    # Extract day number from "Day 1", "Day 2", etc.
-                    day_match = re.search(r'Day\s+(\d+)', day_text)
-                    if day_match:
-                        day_info['day'] = day_match.group(1)
-                    else:
-                        # Skip if it doesn't match day pattern
-                        continue
+            # Look for description in the content-wrap div
+            content_wrap = _first(_CONTENT_WRAP_XPATH, second_div)
+            if content_wrap is not None:
+                # Try to find the description text in various nested structures
+                description_text = ""
                 
-                # Second div contains location and description
-                second_div = divs[1]
-                location_h5 = second_div.find('h5')
-                if location_h5:
-                    location_text = location_h5.get_text(strip=True)
-                    day_info['title'] = self.clean_text(location_text)
-                    # Set icon based on title
-                    day_info['icon'] = self.determine_icon(day_info['title'])
+                # First try: text-info-summary span, either nested in a
+                # text-info span (original structure) or direct (new structure)
+                text_summary = _first(_TEXT_SUMMARY_XPATH, content_wrap)
+                if text_summary is not None:
+                    description_text = _text(text_summary)
                 
-                # Look for description in the content-wrap div
-                content_wrap = second_div.find('div', class_='content-wrap')
-                if content_wrap:
-                    # Try to find the description text in various nested structures
-                    description_text = ""
-                    
-                    # First try: text-info-summary span (original structure)
-                    text_info = content_wrap.find('span', class_='text-info')
-                    if text_info:
-                        text_summary = text_info.find('span', class_='text-info-summary')
-                        if text_summary:
-                            description_text = text_summary.get_text(strip=True)
-                    
-                    # Second try: direct text-info-summary (new structure)
-                    if not description_text:
-                        text_summary = content_wrap.find('span', class_='text-info-summary')
-                        if text_summary:
-                            description_text = text_summary.get_text(strip=True)
-                    
-                    # Third try: any text in descr div
-                    if not description_text:
-                        descr_div = content_wrap.find('div', class_='descr')
-                        if descr_div:
-                            # Get all text but exclude "More" and "Less" buttons
-                            for element in descr_div.find_all(['span'], class_=['more', 'less']):
-                                element.decompose()
-                            description_text = descr_div.get_text(strip=True)
-                    
-                    if description_text:
-                        day_info['body'] = self.clean_text(description_text)
+                # Second try: any text in descr div
+                if not description_text:
+                    descr_div = _first(_DESCR_XPATH, content_wrap)
+                    if descr_div is not None:
+                        # Get all text but exclude "More" and "Less" buttons
+                        description_text = ''.join(
+                            text.strip() for text in _DESCR_TEXT_XPATH(descr_div)
+                        )
                 
-                # Handle special case for "At Sea" days which might not have descriptions
-                if not day_info['body'] and day_info['title'] == "At Sea":
-                    day_info['body'] = "Day at sea - enjoy the ship's amenities and relax as you cruise to your next destination."
+                if description_text:
+                    day_info['body'] = clean(description_text)
             
-            # Only add if we have the essential information (day and title minimum)
-            if day_info['day'] and day_info['title']:
-                # If no body text was found, add a generic message
-                if not day_info['body']:
-                    day_info['body'] = f"Explore {day_info['title']} and enjoy the local attractions and culture."
-                
-                itinerary_items.append(day_info)
+            # Handle special case for "At Sea" days which might not have descriptions
+            if not day_info['body'] and day_info['title'] == "At Sea":
+                day_info['body'] = "Day at sea - enjoy the ship's amenities and relax as you cruise to your next destination."
         
-        return itinerary_items
+        # Only keep if we have the essential information (day and title minimum)
+        if day_info['day'] and day_info['title']:
+            # If no body text was found, add a generic message
+            if not day_info['body']:
+                day_info['body'] = f"Explore {day_info['title']} and enjoy the local attractions and culture."
+            
+            return day_info
+        
+        return None
 
-    def parse_tour_itinerary_description(self, soup):
+    def parse_tour_itinerary_description(self, tree):
         """Extract the tour itinerary description/summary"""
         # Look for the itinerary description section
-        description_elem = soup.find('div', class_='ao-clp-custom-tdp-itinerary__description')
-        if description_elem:
+        description_elem = _first(_TOUR_DESCRIPTION_XPATH, tree)
+        if description_elem is not None:
             # Get text and clean up extra whitespace
-            text = description_elem.get_text(strip=True)
+            text = _text(description_elem)
             text = self.clean_text(text)
-            # Split into sentences and clean up
-            sentences = [s.strip() for s in text.split('.') if s.strip()]
-            return ['. '.join(sentences)]
+            # Normalise sentence breaks to ". " and drop empty sentences
+            return [_SENTENCE_BREAK_RE.sub('. ', text).strip().strip('. ')]
         return [""]
     
-    def parse_tour_itinerary_days(self, soup):
-        """Extract individual tour day itineraries"""
+    def parse_tour_itinerary_days(self, itinerary_section):
+        """Extract individual tour day itineraries from the itinerary section"""
         itinerary_items = []
         
-        # Find the itinerary section specifically (not inclusions)
-        itinerary_section = soup.find('section', class_='ao-clp-custom-tdp-itinerary')
-        if not itinerary_section:
+        if itinerary_section is None:
             return itinerary_items
         
         # Find all itinerary day items within the itinerary section only
-        day_items = itinerary_section.find_all('li', class_='js-ao-common-accordion')
+        day_items = _TOUR_DAY_XPATH(itinerary_section)
         
         for item in day_items:
             day_info = {}
@@ -217,23 +383,23 @@ class FlightCentreScraper:
             day_info['body'] = ""
             
             # Get the day title (e.g., "Day 1: Hanoi")
-            title_elem = item.find('div', class_='js-ao-common-accordion__title')
-            if title_elem:
-                title_text = title_elem.get_text(strip=True)
+            title_elem = _first(_TOUR_TITLE_XPATH, item)
+            if title_elem is not None:
+                title_text = _text(title_elem)
                 # Remove the arrow element text if present
-                arrow_elem = title_elem.find('div', class_='ao-common-accordion__arrow')
-                if arrow_elem:
-                    arrow_text = arrow_elem.get_text(strip=True)
+                arrow_elem = _first(_TOUR_ARROW_XPATH, title_elem)
+                if arrow_elem is not None:
+                    arrow_text = _text(arrow_elem)
                     title_text = title_text.replace(arrow_text, '').strip()
                 
                 title_text = self.clean_text(title_text)
                 
                 # Extract day number and clean title
-                day_match = re.search(r'Day (\d+):', title_text)
+                day_match = _DAY_COLON_RE.search(title_text)
                 if day_match:
                     day_info['day'] = day_match.group(1)
                     # Remove "Day X: " from the title, keeping only what comes after
-                    clean_title = re.sub(r'^Day \d+:\s*', '', title_text)
+                    clean_title = _DAY_PREFIX_RE.sub('', title_text)
                     day_info['title'] = clean_title
                     # Set icon based on title
                     day_info['icon'] = self.determine_icon(day_info['title'])
@@ -244,14 +410,14 @@ class FlightCentreScraper:
                 continue
             
             # Get the day content/body
-            content_elem = item.find('div', class_='ao-common-accordion__bottom-content')
-            if content_elem:
+            content_elem = _first(_TOUR_CONTENT_XPATH, item)
+            if content_elem is not None:
                 # Get all paragraphs in the content
-                paragraphs = content_elem.find_all('p')
+                paragraphs = content_elem.findall('.//p')
                 if paragraphs:
-                    body_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+                    body_text = ' '.join(_text(p) for p in paragraphs)
                 else:
-                    body_text = content_elem.get_text(strip=True)
+                    body_text = _text(content_elem)
                 body_text = self.clean_text(body_text)
                 day_info['body'] = body_text
             
@@ -268,28 +434,59 @@ class FlightCentreScraper:
         if scraper_type is None:
             raise Exception("URL is not a recognized Flight Centre cruise or tour URL")
         
-        # Parse URL to get base domain
-        parsed_url = urlparse(url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        # Get base domain ("scheme://netloc") from the URL
+        base_url = '/'.join(url.split('/', 3)[:3])
         
         # Check robots.txt (for politeness)
         self.check_robots_txt(base_url)
         
-        # Fetch the page
-        html_content = self.fetch_page(url)
+        # Fetch and parse the page
+        tree = self.fetch_page(url, scraper_type)
+        
+        return self.parse_content(scraper_type, tree)
+    
+    async def _scrape_one(self, session, url):
+        """Scrape a single URL as part of a concurrent batch"""
+        scraper_type = self.determine_scraper_type(url)
+        
+        if scraper_type is None:
+            raise Exception("URL is not a recognized Flight Centre cruise or tour URL")
+        
+        tree = await self._fetch(session, url, scraper_type)
         
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'lxml')
+        return self.parse_content(scraper_type, tree)
+    
+    async def scrape_many(self, urls):
+        """Scrape several URLs concurrently, returning results in input order
         
+        A URL that fails yields its exception in place of a result, so one bad
+        page does not discard the rest of the batch.
+        """
+        connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
+            return await asyncio.gather(
+                *[self._scrape_one(session, url) for url in urls],
+                return_exceptions=True
+            )
+    
+    def parse_content(self, scraper_type, tree):
+        """Extract the summary/itinerary result from a parsed page"""
         if scraper_type == "cruise":
+            # Find the itinerary container first
+            itinerary_root = _first(_CRUISE_CONTAINER_XPATH, tree)
+            if itinerary_root is None:
+                # Try alternative selector
+                itinerary_root = _first(_CRUISE_ALT_CONTAINER_XPATH, tree)
             # For cruises, there's typically no summary section
             summary = [""]
-            itinerary = self.parse_cruise_itinerary_days(soup)
+            itinerary = self.parse_cruise_itinerary_days(itinerary_root)
         else:  # tour
+            # Find the itinerary section specifically (not inclusions)
+            itinerary_root = _first(_TOUR_SECTION_XPATH, tree)
             # Extract summary (itinerary description)
-            summary = self.parse_tour_itinerary_description(soup)
+            summary = self.parse_tour_itinerary_description(tree)
             # Extract itinerary days
-            itinerary = self.parse_tour_itinerary_days(soup)
+            itinerary = self.parse_tour_itinerary_days(itinerary_root)
         
         # Format the result
         result = {
@@ -300,6 +497,13 @@ class FlightCentreScraper:
         return result
 
 
+@st.cache_data(ttl=3600, max_entries=256)
+def _scrape_cached(url):
+    """Scrape a URL, reusing the result for an hour on repeat requests"""
+    scraper = FlightCentreScraper(get_session())
+    return scraper.scrape_content(url)
+
+
 def main():
     st.set_page_config(
         page_title="Cruise and Tour Itinerary Extractor",
@@ -320,11 +524,10 @@ def main():
     # Validation and type detection
     scraper_type = None
     if url:
-        if "cruises.flightcentre" in url:
-            scraper_type = "cruise"
+        scraper_type = FlightCentreScraper.determine_scraper_type(url)
+        if scraper_type == "cruise":
             st.info("🚢 Detected: Cruise URL")
-        elif "tours.flightcentre" in url:
-            scraper_type = "tour"
+        elif scraper_type == "tour":
             st.info("🗺️ Detected: Tour URL")
         else:
             st.warning("⚠️ Please enter a valid Flight Centre cruise or tour URL")
@@ -334,8 +537,7 @@ def main():
         if url:
             try:
                 with st.spinner(f"Scraping {scraper_type} information..."):
-                    scraper = FlightCentreScraper()
-                    result = scraper.scrape_content(url)
+                    result = _scrape_cached(url)
                 
                 # Display results
                 st.success(f"✅ {scraper_type.title()} information extracted successfully!")
@@ -360,8 +562,8 @@ def main():
                 st.header("📄 Extracted Data")
                 
                 # Pretty formatted JSON
-                json_output = json.dumps(result, indent=2, ensure_ascii=False)
-                st.code(json_output, language="json")
+                json_bytes = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+                st.code(json_bytes.decode(), language="json")
                 
                 # Download button
                 filename_part = url.split('/')[-2] if len(url.split('/')) > 2 and url.split('/')[-2] else url.split('/')[-1]
@@ -370,7 +572,7 @@ def main():
                 
                 st.download_button(
                     label="💾 Download JSON",
-                    data=json_output,
+                    data=json_bytes,
                     file_name=f"{scraper_type}_data_{filename_part}.json",
                     mime="application/json"
                 )
@@ -401,6 +603,37 @@ def main():
                 st.error(f"❌ Error: {str(e)}")
                 st.info("Please check the URL and try again. Make sure it's a valid Flight Centre page.")
     
+    # Batch section
+    st.header("Batch Extract")
+    batch_text = st.text_area(
+        "Flight Centre URLs (one per line)",
+        placeholder="https://cruises.flightcentre.com.au/cruises/...\nhttps://tours.flightcentre.com.au/t/..."
+    )
+    batch_urls = [line.strip() for line in batch_text.splitlines() if line.strip()]
+    
+    if st.button("🔍 Extract All", disabled=not batch_urls):
+        with st.spinner(f"Scraping {len(batch_urls)} pages..."):
+            scraper = FlightCentreScraper(get_session())
+            batch_results = asyncio.run(scraper.scrape_many(batch_urls))
+        
+        results = {}
+        for batch_url, batch_result in zip(batch_urls, batch_results):
+            if isinstance(batch_result, Exception):
+                st.error(f"❌ {batch_url}: {str(batch_result)}")
+            else:
+                results[batch_url] = batch_result
+        
+        if results:
+            st.success(f"✅ Extracted {len(results)} of {len(batch_urls)} pages")
+            json_bytes = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+            st.code(json_bytes.decode(), language="json")
+            st.download_button(
+                label="💾 Download JSON",
+                data=json_bytes,
+                file_name="batch_data.json",
+                mime="application/json"
+            )
+    
     # Instructions
     st.header("📖 How to Use")
     st.markdown("""